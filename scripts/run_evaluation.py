@@ -2,48 +2,111 @@
 from __future__ import annotations
 
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import typer
 import yaml
 
-from saral_chatbot.evaluation.metrics import evaluate_output
+try:
+    import torch
+except ImportError:  # pragma: no cover - optional dependency
+    torch = None  # type: ignore
+
+from saral_chatbot.embeddings.embedding_manager import EmbeddingManager
+from saral_chatbot.evaluation.metrics import SimilarityComputer, evaluate_outputs
 from saral_chatbot.pipeline import SaralChatbot
-from saral_chatbot.types import AudienceProfile, AudienceStyle, Duration, GenerationConfig
+from saral_chatbot.types import AudienceProfile, AudienceStyle, Duration, GenerationConfig, GenerationOutput
 
 app = typer.Typer(help="Automatic evaluation harness")
 
 
+def _evaluate_case(item: dict, bot: SaralChatbot) -> Tuple[GenerationOutput, str, str, str]:
+    typer.echo(f"Evaluating {item['paper']} for {item['audience']}")
+    bot.reset()
+    bot.ingest(item["paper"])
+    profile = AudienceProfile(
+        label=item["audience"],
+        style=AudienceStyle(item["style"]),
+        tone_directives=item.get("tone", []),
+    )
+    config_obj = GenerationConfig(
+        duration=Duration(item["duration"]),
+        style=profile.style,
+    )
+    output_bundle = bot.generate(item["instruction"], profile, config_obj)
+    reference_text = Path(item["reference"]).read_text(encoding="utf-8")
+    paper_id = item.get("paper_id", Path(item["paper"]).stem)
+    return output_bundle, reference_text, paper_id, profile.label
+
+
+def evaluate_plan(
+    plan: dict,
+    output: Path,
+    bot: SaralChatbot | None = None,
+    similarity: SimilarityComputer | None = None,
+    cache_dir: Path | None = None,
+    workers: int = 1,
+) -> List[Dict]:
+    """Evaluate every case in ``plan`` and write the records to ``output``.
+
+    Pass an already-warm ``bot`` (and optionally ``similarity``) to reuse loaded
+    models across plans; ``cache_dir`` only applies when the bot is created here.
+    """
+    items = plan.get("cases", [])
+    bot = bot or SaralChatbot(cache_dir=cache_dir)
+    # One embedding model shared by the bots and the similarity metric.
+    embedding_manager = bot.embedding_manager
+    if workers <= 1:
+        cases = [_evaluate_case(item, bot) for item in items]
+    else:
+        local = threading.local()
+
+        def _worker(item: dict) -> Tuple[GenerationOutput, str, str, str]:
+            if not hasattr(local, "bot"):
+                # Stateful backends (TF-IDF) learn a per-paper vocabulary, so each thread needs its own.
+                backend = embedding_manager.backend
+                manager = embedding_manager if backend.cacheable else EmbeddingManager(backend.clone())
+                # The case pool is the only fan-out; no nested embedding pool per ingest.
+                local.bot = SaralChatbot(
+                    embedding_manager=manager,
+                    language_model=bot.language_model,
+                    use_llm=bot.use_llm,
+                    embed_workers=1,
+                )
+            return _evaluate_case(item, local.bot)
+
+        # One torch thread per worker so concurrent cases do not oversubscribe the cores.
+        # The setting is process-wide, so restore it for the caller afterwards.
+        torch_threads = torch.get_num_threads() if torch is not None else None
+        if torch is not None:
+            torch.set_num_threads(1)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                cases = list(executor.map(_worker, items))
+        finally:
+            if torch is not None:
+                torch.set_num_threads(torch_threads)
+    if similarity is None:
+        # Refitting a stateful backend (TF-IDF) would move the bot's retriever into another
+        # vector space, so the metric gets its own copy of it.
+        backend = embedding_manager.backend
+        similarity = SimilarityComputer(embedding_manager if backend.cacheable else EmbeddingManager(backend.clone()))
+    records = [record.__dict__ for record in evaluate_outputs(cases, similarity=similarity)]
+    output.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    return records
+
+
 @app.command()
 def run(
     config: Path = typer.Option(..., help="YAML config describing evaluation set"),
     output: Path = typer.Option(Path("examples/evaluations/test_run_report.json"), help="Where to store metrics"),
+    cache_dir: Optional[Path] = typer.Option(None, help="Directory for cached embeddings, reused across runs (e.g. ~/.cache/saral); off when unset"),
+    workers: int = typer.Option(1, help="Number of cases to evaluate concurrently"),
 ):
-    plan = yaml.safe_load(config.read_text())
-    records = []
-    for item in plan.get("cases", []):
-        typer.echo(f"Evaluating {item['paper']} for {item['audience']}")
-        bot = SaralChatbot()
-        bot.ingest(item["paper"])
-        profile = AudienceProfile(
-            label=item["audience"],
-            style=AudienceStyle(item["style"]),
-            tone_directives=item.get("tone", []),
-        )
-        config_obj = GenerationConfig(
-            duration=Duration(item["duration"]),
-            style=profile.style,
-        )
-        output_bundle = bot.generate(item["instruction"], profile, config_obj)
-        reference_text = Path(item["reference"]).read_text(encoding="utf-8")
-        record = evaluate_output(
-            output_bundle,
-            reference_text,
-            paper_id=item.get("paper_id", Path(item["paper"]).stem),
-            audience=profile.label,
-        )
-        records.append(record.__dict__)
-    output.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    evaluate_plan(yaml.safe_load(config.read_text()), output, cache_dir=cache_dir, workers=workers)
     typer.echo(f"Saved results to {output}")
 
 
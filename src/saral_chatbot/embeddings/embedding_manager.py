@@ -1,40 +1,82 @@
 """Embedding utilities with pluggable backends."""
 from __future__ import annotations
 
+import copy
+import hashlib
 import logging
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
 
 import numpy as np
 
 LOGGER = logging.getLogger(__name__)
 
+# Suggested ``cache_dir`` for the on-disk embedding cache. Caching is opt-in:
+# nothing is written unless a caller passes a directory.
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "saral"
+
+# Keys per SELECT, below SQLite's default bound-parameter limit.
+_SQLITE_BATCH = 500
+
 
 class EmbeddingBackend:
     name: str = "base"
+    # Whether a text always maps to the same vector, i.e. results may be cached.
+    cacheable: bool = True
+    # Whether embed() mostly waits on a remote service, so concurrent calls overlap.
+    io_bound: bool = False
 
-    def embed(self, texts: Sequence[str]) -> List[List[float]]:  # pragma: no cover - interface
+    def embed(self, texts: Sequence[str]) -> np.ndarray:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def reset(self) -> None:
+        """Drop any state learned from previous corpora."""
+
+    def clone(self) -> "EmbeddingBackend":
+        """Independent copy with the same settings and no learned state."""
+        twin = copy.deepcopy(self)
+        twin.reset()
+        return twin
+
 
 @dataclass
 class SentenceTransformerBackend(EmbeddingBackend):
     model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    batch_size: int = 64
+    normalize_embeddings: bool = False
 
     def __post_init__(self) -> None:
         from sentence_transformers import SentenceTransformer  # local import
 
         self.model = SentenceTransformer(self.model_name)
+        # The name keys EmbeddingCache entries, so it covers every output-affecting setting.
         self.name = f"sentence_transformer::{self.model_name}"
+        if self.normalize_embeddings:
+            self.name += "::normalized"
 
-    def embed(self, texts: Sequence[str]) -> List[List[float]]:
-        return self.model.encode(list(texts), convert_to_numpy=True).tolist()
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        # encode() sorts inputs by length before batching, so minibatches are
+        # padded to similar lengths; results come back in input order.
+        return self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize_embeddings,
+            show_progress_bar=False,
+        )
 
 
 @dataclass
 class OpenAIEmbeddingBackend(EmbeddingBackend):
     model: str = "text-embedding-3-small"
+    batch_size: int = 256
+    io_bound = True
 
     def __post_init__(self) -> None:
         try:
@@ -48,29 +90,134 @@ class OpenAIEmbeddingBackend(EmbeddingBackend):
         self.client = OpenAI(api_key=api_key)
         self.name = f"openai::{self.model}"
 
-    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        # The endpoint accepts a list input and returns vectors in request order,
+        # so send sub-batches instead of one request per text.
+        items = list(texts)
         vectors: List[List[float]] = []
-        for text in texts:
-            resp = self.client.embeddings.create(model=self.model, input=text)
-            vectors.append(list(resp.data[0].embedding))
-        return vectors
+        for start in range(0, len(items), self.batch_size):
+            resp = self.client.embeddings.create(model=self.model, input=items[start : start + self.batch_size])
+            vectors.extend(d.embedding for d in resp.data)
+        return np.asarray(vectors, dtype=np.float32)
 
 
 class TfidfBackend(EmbeddingBackend):
+    cacheable = False
+
     def __init__(self) -> None:
         from sklearn.feature_extraction.text import TfidfVectorizer  # local import
 
         self.vectorizer = TfidfVectorizer(max_features=2048)
         self.name = "tfidf"
-
-    def embed(self, texts: Sequence[str]) -> List[List[float]]:
-        matrix = self.vectorizer.fit_transform(texts)
-        return matrix.toarray().tolist()
+        self._fitted = False
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        # Learn the vocabulary on the first call only so later embeddings
+        # (e.g. queries) live in the same space as the corpus.
+        if self._fitted:
+            matrix = self.vectorizer.transform(texts)
+        else:
+            matrix = self.vectorizer.fit_transform(texts)
+            self._fitted = True
+        return matrix.toarray()
+
+    def reset(self) -> None:
+        self._fitted = False
+
+
+class EmbeddingCache(EmbeddingBackend):
+    """Content-addressed cache in front of another backend.
+
+    Vectors are keyed by a blake2b hash of the backend name and text, kept in an
+    in-memory LRU and, when ``cache_dir`` is set, persisted to a single SQLite
+    file (``embeddings.sqlite``) so repeat runs skip the model entirely.
+    """
+
+    def __init__(self, backend: EmbeddingBackend, cache_dir: str | os.PathLike | None = None, max_entries: int = 10_000) -> None:
+        self.backend = backend
+        self.name = backend.name
+        self.io_bound = backend.io_bound
+        self.db_path: Path | None = None
+        if cache_dir is not None:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            self.db_path = Path(cache_dir) / "embeddings.sqlite"
+            with closing(self._connect()) as conn, conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+        self.max_entries = max_entries
+        self._memory: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the cache usable from worker threads.
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.blake2b(f"{self.backend.name}\0{text}".encode("utf-8"), digest_size=16).digest()
+
+    def _remember(self, key: bytes, vector: np.ndarray) -> None:
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _lookup(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+        pending = [key for key in dict.fromkeys(keys) if key not in found]
+        if self.db_path is not None and pending:
+            with closing(self._connect()) as conn:
+                for start in range(0, len(pending), _SQLITE_BATCH):
+                    batch = pending[start : start + _SQLITE_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = conn.execute(f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", batch)
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+        return found
+
+    def _store(self, vectors: Dict[bytes, np.ndarray]) -> None:
+        for key, vector in vectors.items():
+            self._remember(key, vector)
+        if self.db_path is not None:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                    [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors.items()],
+                )
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        items = list(texts)
+        if not items:
+            return self.backend.embed(items)
+        keys = [self._key(text) for text in items]
+        found = self._lookup(keys)
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, items):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            fresh = dict(zip(missing, self.backend.embed(list(missing.values()))))
+            self._store(fresh)
+            found.update(fresh)
+        return np.stack([found[key] for key in keys])
+
+    def reset(self) -> None:
+        self.backend.reset()
 
 
 class EmbeddingManager:
-    def __init__(self, backend: EmbeddingBackend | None = None) -> None:
-        self.backend = backend or self._default_backend()
+    def __init__(self, backend: EmbeddingBackend | None = None, cache_dir: str | os.PathLike | None = None) -> None:
+        backend = backend or self._default_backend()
+        if cache_dir is not None and backend.cacheable:
+            backend = EmbeddingCache(backend, cache_dir=cache_dir)
+        self.backend = backend
 
     def _default_backend(self) -> EmbeddingBackend:
         try:
@@ -79,6 +226,9 @@ class EmbeddingManager:
             LOGGER.warning("Falling back to TF-IDF backend: %s", exc)
             return TfidfBackend()
 
-    def embed(self, texts: Iterable[str]) -> List[np.ndarray]:
-        vectors = self.backend.embed(list(texts))
-        return [np.array(v, dtype=float) for v in vectors]
+    def reset(self) -> None:
+        self.backend.reset()
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """Return a C-contiguous float32 (N, D) matrix with one row per input text."""
+        return np.ascontiguousarray(self.backend.embed(list(texts)), dtype=np.float32)
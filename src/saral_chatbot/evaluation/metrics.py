@@ -1,12 +1,18 @@
 """Evaluation helpers for SARAL outputs."""
 from __future__ import annotations
 
+import functools
 import logging
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Sequence, Tuple
 
 import numpy as np
-from rouge_score import rouge_scorer
+from rouge_score import rouge_scorer, scoring, tokenizers
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None  # type: ignore
 
 from ..embeddings.embedding_manager import EmbeddingManager
 from ..types import ContentBlock, EvaluationRecord, GenerationOutput
@@ -22,15 +28,75 @@ class SimilarityComputer:
         self.embedding_manager = self.embedding_manager or EmbeddingManager()
 
     def score(self, generated: str, reference: str) -> float:
-        vectors = self.embedding_manager.embed([generated, reference])
-        a, b = vectors
-        denom = np.linalg.norm(a) * np.linalg.norm(b) + 1e-8
-        return float(np.dot(a, b) / denom)
+        return float(self.score_many([(generated, reference)])[0])
+
+    def score_many(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        """Cosine similarity for each (generated, reference) pair from one embed call."""
+        if not pairs:
+            return np.zeros(0)
+        if not self.embedding_manager.backend.cacheable:
+            # A TF-IDF score depends on the texts it was fit on, so fit on each pair alone.
+            return np.concatenate([self._cosines([pair]) for pair in pairs])
+        return self._cosines(pairs)
+
+    def _cosines(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        if not self.embedding_manager.backend.cacheable:
+            # Stateful backends (TF-IDF) keep the vocabulary of their first call; refit.
+            self.embedding_manager.reset()
+        texts = [text for pair in pairs for text in pair]
+        matrix = np.ascontiguousarray(self.embedding_manager.embed(texts), dtype=np.float32).reshape(len(pairs), 2, -1)
+        a, b = matrix[:, 0], matrix[:, 1]
+        norms = np.linalg.norm(matrix, axis=2)
+        return np.einsum("nd,nd->n", a, b) / (norms[:, 0] * norms[:, 1] + 1e-8)
+
+
+@functools.lru_cache(maxsize=4)
+def _rouge_scorer(use_stemmer: bool = True) -> rouge_scorer.RougeScorer:
+    return rouge_scorer.RougeScorer(["rougeL"], use_stemmer=use_stemmer)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _lcs_len(a: np.ndarray, b: np.ndarray) -> int:
+        prev = np.zeros(b.shape[0] + 1, dtype=np.int32)
+        curr = np.zeros(b.shape[0] + 1, dtype=np.int32)
+        for i in range(a.shape[0]):
+            for j in range(b.shape[0]):
+                if a[i] == b[j]:
+                    curr[j + 1] = prev[j] + 1
+                else:
+                    curr[j + 1] = max(prev[j + 1], curr[j])
+            prev, curr = curr, prev
+        return prev[b.shape[0]]
+
+else:
+    _lcs_len = None
+
+
+@functools.lru_cache(maxsize=4)
+def _rouge_tokenizer(use_stemmer: bool = True) -> tokenizers.DefaultTokenizer:
+    return tokenizers.DefaultTokenizer(use_stemmer=use_stemmer)
+
+
+def _rouge_l_numba(generated: str, reference: str) -> float:
+    tokenizer = _rouge_tokenizer()
+    target = tokenizer.tokenize(reference)
+    prediction = tokenizer.tokenize(generated)
+    if not target or not prediction:
+        return 0.0
+    vocab: Dict[str, int] = {}
+    target_ids = np.array([vocab.setdefault(t, len(vocab)) for t in target], dtype=np.int32)
+    prediction_ids = np.array([vocab.setdefault(t, len(vocab)) for t in prediction], dtype=np.int32)
+    lcs = int(_lcs_len(target_ids, prediction_ids))
+    return scoring.fmeasure(lcs / len(prediction), lcs / len(target))
 
 
 def rouge_l_score(generated: str, reference: str) -> float:
-    scorer = rouge_scorer.RougeScorer(["rougeL"], use_stemmer=True)
-    scores = scorer.score(reference, generated)
+    # Same tokenization and F-measure as rouge_scorer, with the LCS table JIT-compiled.
+    if _lcs_len is not None:
+        return float(_rouge_l_numba(generated, reference))
+    scores = _rouge_scorer().score(reference, generated)
     return float(scores["rougeL"].fmeasure)
 
 
@@ -54,17 +120,27 @@ def evaluate_output(
     audience: str,
     similarity: SimilarityComputer | None = None,
 ) -> EvaluationRecord:
+    return evaluate_outputs([(output, reference_script, paper_id, audience)], similarity=similarity)[0]
+
+
+def evaluate_outputs(
+    cases: Sequence[Tuple[GenerationOutput, str, str, str]],
+    similarity: SimilarityComputer | None = None,
+) -> List[EvaluationRecord]:
+    """Evaluate (output, reference_script, paper_id, audience) cases with one batched similarity pass."""
     similarity = similarity or SimilarityComputer()
-    generated_text = " ".join(block.text for block in output.script)
-    rouge = rouge_l_score(generated_text, reference_script)
-    sim = similarity.score(generated_text, reference_script)
-    prov = provenance_coverage(output.script)
-    cite = citation_coverage(output)
-    return EvaluationRecord(
-        paper_id=paper_id,
-        audience=audience,
-        rouge_l=rouge,
-        semantic_similarity=sim,
-        provenance_coverage=prov,
-        citation_coverage=cite,
-    )
+    generated_texts = [" ".join(block.text for block in output.script) for output, *_ in cases]
+    sims = similarity.score_many([(generated, case[1]) for generated, case in zip(generated_texts, cases)])
+    records = []
+    for generated_text, sim, (output, reference_script, paper_id, audience) in zip(generated_texts, sims, cases):
+        records.append(
+            EvaluationRecord(
+                paper_id=paper_id,
+                audience=audience,
+                rouge_l=rouge_l_score(generated_text, reference_script),
+                semantic_similarity=float(sim),
+                provenance_coverage=provenance_coverage(output.script),
+                citation_coverage=citation_coverage(output),
+            )
+        )
+    return records
@@ -3,11 +3,11 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple
 
 from ..ingestion.chunker import simple_sentence_split
 from ..types import AudienceProfile, AudienceStyle, ContentBlock, Duration, GenerationConfig, GenerationOutput, Provenance, RetrievalResult
-from .language_models import BaseLanguageModel, DummyLanguageModel
+from .language_models import OUTPUT_KEYS, BaseLanguageModel, DummyLanguageModel
 from .prompt_builder import build_prompt
 from .safety import describe_safety_rules, enforce_safety
 
@@ -32,6 +32,10 @@ def _style_prefix(style: AudienceStyle) -> str:
     }.get(style, "Insight:")
 
 
+# Joins sentences for a single safety pass; no safety pattern can span it.
+_SENTENCE_SENTINEL = "\n\u0001\n"
+
+
 @dataclass
 class BaseGenerator:
     def generate_outputs(
@@ -53,15 +57,19 @@ class RuleBasedGenerator(BaseGenerator):
         config: GenerationConfig,
         audience: AudienceProfile,
     ) -> GenerationOutput:
-        sentences: List[ContentBlock] = []
+        raw_sentences: List[str] = []
+        sources: List[RetrievalResult] = []
         for result in retrievals:
             split = simple_sentence_split(result.chunk.text)
-            for sentence in split:
-                safe_sentence = enforce_safety(sentence)
-                provenance = [
-                    Provenance(chunk_id=result.chunk.chunk_id, page=result.chunk.page, score=result.score)
-                ]
-                sentences.append(ContentBlock(text=safe_sentence, provenance=provenance))
+            raw_sentences.extend(split)
+            sources.extend([result] * len(split))
+        safe_sentences = enforce_safety(_SENTENCE_SENTINEL.join(raw_sentences)).split(_SENTENCE_SENTINEL) if raw_sentences else []
+        sentences: List[ContentBlock] = []
+        for safe_sentence, result in zip(safe_sentences, sources):
+            provenance = [
+                Provenance(chunk_id=result.chunk.chunk_id, page=result.chunk.page, score=result.score)
+            ]
+            sentences.append(ContentBlock(text=safe_sentence, provenance=provenance))
 
         script_budget = SCRIPT_SENTENCES[config.duration]
         slides_budget = SLIDE_BUDGET[config.duration]
@@ -120,6 +128,29 @@ class LLMGenerator(BaseGenerator):
         config: GenerationConfig,
         audience: AudienceProfile,
     ) -> GenerationOutput:
+        return self.generate_outputs_batch([(instruction, retrievals)], config, audience)[0]
+
+    def generate_outputs_batch(
+        self,
+        requests: Sequence[Tuple[str, List[RetrievalResult]]],
+        config: GenerationConfig,
+        audience: AudienceProfile,
+    ) -> List[GenerationOutput]:
+        """Generate outputs for several (instruction, retrievals) pairs with one model call."""
+        prompts = [self._prompt(instruction, retrievals, config, audience) for instruction, retrievals in requests]
+        replies = self.language_model.generate_structured_batch(prompts)
+        return [
+            self._parse(data, instruction, retrievals, config, audience)
+            for data, (instruction, retrievals) in zip(replies, requests)
+        ]
+
+    def _prompt(
+        self,
+        instruction: str,
+        retrievals: List[RetrievalResult],
+        config: GenerationConfig,
+        audience: AudienceProfile,
+    ) -> str:
         prompt = build_prompt(
             instruction=instruction,
             context_chunks=retrievals,
@@ -134,12 +165,19 @@ class LLMGenerator(BaseGenerator):
             "tweets": ["Tweet"],
             "linkedin": ["Summary"],
         }
-        prompt += "\nReturn valid JSON with keys: slides, script, notes, tweets, linkedin."
+        prompt += f"\nReturn valid JSON with keys: {', '.join(OUTPUT_KEYS)}."
         prompt += f"\nFormat hint: {json.dumps(format_hint)}"
-        raw = self.language_model.generate(prompt)
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+        return prompt
+
+    def _parse(
+        self,
+        data: Dict | None,
+        instruction: str,
+        retrievals: List[RetrievalResult],
+        config: GenerationConfig,
+        audience: AudienceProfile,
+    ) -> GenerationOutput:
+        if data is None:
             # fallback to deterministic generator
             return RuleBasedGenerator().generate_outputs(instruction, retrievals, config, audience)
 
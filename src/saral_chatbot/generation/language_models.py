@@ -4,13 +4,30 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional, Sequence
+
+OUTPUT_KEYS = ("slides", "script", "notes", "tweets", "linkedin")
 
 
 class BaseLanguageModel:
     def generate(self, prompt: str) -> str:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def generate_batch(self, prompts: Sequence[str]) -> List[str]:
+        """Generate one completion per prompt; backends override this to batch."""
+        return [self.generate(prompt) for prompt in prompts]
+
+    def generate_structured_batch(self, prompts: Sequence[str]) -> List[Optional[Dict]]:
+        """Parse each completion as a JSON object; ``None`` marks unusable replies."""
+        results: List[Optional[Dict]] = []
+        for raw in self.generate_batch(prompts):
+            try:
+                data = json.loads(raw)
+            except json.JSONDecodeError:
+                data = None
+            results.append(data if isinstance(data, dict) else None)
+        return results
+
 
 @dataclass
 class OpenAILanguageModel(BaseLanguageModel):
@@ -35,11 +52,19 @@ class OpenAILanguageModel(BaseLanguageModel):
 
 
 class DummyLanguageModel(BaseLanguageModel):
-    """A deterministic stub that simply returns the prompt."""
+    """A deterministic stub that returns empty sections plus an echo of the prompt."""
+
+    def _payload(self, prompt: str) -> Dict:
+        payload: Dict = {key: [] for key in OUTPUT_KEYS}
+        payload["prompt_echo"] = prompt[-400:]
+        return payload
 
     def generate(self, prompt: str) -> str:
-        payload = {"prompt_echo": prompt[-400:]}
-        return json.dumps(payload)
+        return json.dumps(self._payload(prompt))
+
+    def generate_structured_batch(self, prompts: Sequence[str]) -> List[Optional[Dict]]:
+        # Already structured; skip the JSON round-trip.
+        return [self._payload(prompt) for prompt in prompts]
 
 
 @dataclass
@@ -52,24 +77,56 @@ class HFTextGenerationModel(BaseLanguageModel):
     model_name: str = "google/flan-t5-small"
     device: str = "cpu"
     max_new_tokens: int = 256
+    batch_size: int = 8
+    compile: bool = False
 
     def __post_init__(self) -> None:
         try:
+            import torch
             from transformers import AutoModelForSeq2SeqLM, AutoTokenizer  # type: ignore
         except ImportError as exc:  # pragma: no cover
             raise ImportError("Install transformers to use HFTextGenerationModel") from exc
 
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+        # bfloat16 halves weight traffic on GPUs that support it; T5 overflows in
+        # float16, so anything else stays in float32.
+        use_bf16 = self.device.startswith("cuda") and torch.cuda.is_bf16_supported()
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, use_fast=True)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(
+            self.model_name,
+            torch_dtype=torch.bfloat16 if use_bf16 else torch.float32,
+        )
+        self.model.eval()
         if self.device != "cpu":
             self.model.to(self.device)
+        if self.compile:
+            self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead")
 
     def generate(self, prompt: str) -> str:
-        inputs = self.tokenizer(
-            prompt,
-            return_tensors="pt",
-            truncation=True,
-            max_length=512,
-        ).to(self.model.device)
-        output = self.model.generate(**inputs, max_new_tokens=self.max_new_tokens)
-        return self.tokenizer.decode(output[0], skip_special_tokens=True)
+        return self.generate_batch([prompt])[0]
+
+    def generate_batch(self, prompts: Sequence[str]) -> List[str]:
+        import torch  # installed alongside transformers
+
+        # Batch prompts of similar length together to keep padding small.
+        order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+        results: List[str] = [""] * len(prompts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start : start + self.batch_size]
+            inputs = self.tokenizer(
+                [prompts[i] for i in batch],
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=512,
+            ).to(self.model.device)
+            with torch.inference_mode():
+                output = self.model.generate(
+                    **inputs,
+                    max_new_tokens=self.max_new_tokens,
+                    do_sample=False,
+                    num_beams=1,
+                    use_cache=True,
+                )
+            for i, text in zip(batch, self.tokenizer.batch_decode(output, skip_special_tokens=True)):
+                results[i] = text
+        return results
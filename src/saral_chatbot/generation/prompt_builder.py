@@ -1,7 +1,8 @@
 """Prompt construction utilities."""
 from __future__ import annotations
 
-from typing import List
+import functools
+from typing import List, Tuple
 
 from ..types import AudienceProfile, AudienceStyle, Duration, RetrievalResult
 
@@ -17,6 +18,28 @@ DURATION_BOUNDS = {
     Duration.LONG_5MIN: 700,
 }
 
+SOURCE_TEMPLATE = "[Source {index} | chunk={chunk_id} | page={page} | score={score:.3f}]\n{text}"
+
+
+@functools.lru_cache(maxsize=32)
+def _prompt_header(
+    audience_label: str,
+    style: AudienceStyle,
+    tone_directives: Tuple[str, ...],
+    duration: Duration,
+    safety_directives: Tuple[str, ...],
+) -> str:
+    """Everything between the instruction and the sources; constant within a sweep."""
+    safety = "\n".join(safety_directives)
+    tip = STYLE_TIPS.get(style, "")
+    max_tokens = DURATION_BOUNDS.get(duration, 300)
+    return f"""Audience: {audience_label}
+Tone guidance: {', '.join(tone_directives) or 'default'}
+Style tips: {tip}
+Context budget: {max_tokens} sentences.
+Safety requirements: {safety or 'Avoid offensive or exclusionary language. Prefer accessible descriptions.'}
+Use inline citations of the form (chunk-id @ page) for every sentence referencing the sources below."""
+
 
 def build_prompt(
     instruction: str,
@@ -25,26 +48,28 @@ def build_prompt(
     duration: Duration,
     safety_directives: List[str] | None = None,
 ) -> str:
-    context_text = []
-    for idx, result in enumerate(context_chunks, start=1):
-        chunk = result.chunk
-        context_text.append(
-            f"[Source {idx} | chunk={chunk.chunk_id} | page={chunk.page} | score={result.score:.3f}]\n{chunk.text}"
+    context_block = "\n\n".join(
+        SOURCE_TEMPLATE.format(
+            index=idx,
+            chunk_id=result.chunk.chunk_id,
+            page=result.chunk.page,
+            score=result.score,
+            text=result.chunk.text,
         )
-    context_block = "\n\n".join(context_text)
-    safety = "\n".join(safety_directives or [])
-    tip = STYLE_TIPS.get(audience.style, "")
-    max_tokens = DURATION_BOUNDS.get(duration, 300)
+        for idx, result in enumerate(context_chunks, start=1)
+    )
+    header = _prompt_header(
+        audience.label,
+        audience.style,
+        tuple(audience.tone_directives),
+        duration,
+        tuple(safety_directives or ()),
+    )
 
     prompt = f"""
 You are SARAL, a fact-grounded assistant that writes audience-specific presentations.
 Instruction: {instruction}
-Audience: {audience.label}
-Tone guidance: {', '.join(audience.tone_directives) or 'default'}
-Style tips: {tip}
-Context budget: {max_tokens} sentences.
-Safety requirements: {safety or 'Avoid offensive or exclusionary language. Prefer accessible descriptions.'}
-Use inline citations of the form (chunk-id @ page) for every sentence referencing the sources below.
+{header}
 
 Sources:\n{context_block}
 """
@@ -2,7 +2,12 @@
 from __future__ import annotations
 
 import re
-from typing import List
+from typing import Iterable, List
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None  # type: ignore
 
 BLOCKED_TERMS = {
     "hate",
@@ -16,14 +21,55 @@ JARGON_MAP = {
 }
 
 
+def _alternation(terms: Iterable[str]) -> re.Pattern:
+    # Longest first so overlapping phrases prefer the most specific match.
+    return re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+
+
+_BLOCKED_RE = _alternation(BLOCKED_TERMS)
+_JARGON_RE = _alternation(JARGON_MAP)
+_JARGON_REPLACEMENTS = {jargon.lower(): f"{simple} (formerly \"{jargon}\")" for jargon, simple in JARGON_MAP.items()}
+
+
+def _build_automaton():
+    automaton = ahocorasick.Automaton()
+    replacements = {term: "[removed]" for term in BLOCKED_TERMS}
+    replacements.update(_JARGON_REPLACEMENTS)
+    for term, replacement in replacements.items():
+        automaton.add_word(term.lower(), (len(term), replacement))
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATON = _build_automaton() if ahocorasick is not None else None
+
+
+def _scan_automaton(text: str, lowered: str) -> str:
+    # Keep leftmost-longest, non-overlapping hits to mirror the regex alternation.
+    hits = sorted(
+        ((end - length + 1, end + 1, replacement) for end, (length, replacement) in _AUTOMATON.iter(lowered)),
+        key=lambda hit: (hit[0], -hit[1]),
+    )
+    pieces: List[str] = []
+    cursor = 0
+    for start, end, replacement in hits:
+        if start < cursor:
+            continue
+        pieces.append(text[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(text[cursor:])
+    return "".join(pieces)
+
+
 def enforce_safety(text: str) -> str:
-    lowered = text.lower()
-    for term in BLOCKED_TERMS:
-        if term in lowered:
-            text = text.replace(term, "[removed]")
-    for jargon, simple in JARGON_MAP.items():
-        text = re.sub(jargon, f"{simple} (formerly \"{jargon}\")", text, flags=re.IGNORECASE)
-    return text
+    if _AUTOMATON is not None:
+        lowered = text.lower()
+        # Offsets only line up when lowercasing preserves length.
+        if len(lowered) == len(text):
+            return _scan_automaton(text, lowered)
+    text = _BLOCKED_RE.sub("[removed]", text)
+    return _JARGON_RE.sub(lambda m: _JARGON_REPLACEMENTS[m.group(0).lower()], text)
 
 
 def describe_safety_rules() -> List[str]:
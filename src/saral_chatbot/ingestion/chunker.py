@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Dict, Iterable, List
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List
 
 from ..types import RetrievedChunk
 
@@ -24,36 +26,43 @@ def simple_sentence_split(text: str) -> List[str]:
 
 def chunk_text(full_text: str, page_map: Dict[int, str], config: ChunkConfig) -> List[RetrievedChunk]:
     sentences = simple_sentence_split(full_text)
+    infer_page = _page_lookup(page_map)
     window: List[str] = []
+    # Length of " ".join(window), tracked so the window is only joined at chunk boundaries.
+    window_len = 0
     chunks: List[RetrievedChunk] = []
     pointer = 0
     for sentence in sentences:
+        window_len += len(sentence) + (1 if window else 0)
         window.append(sentence)
         pointer += len(sentence)
-        joined = " ".join(window)
-        if len(joined) >= config.chunk_size:
+        if window_len >= config.chunk_size:
+            joined = " ".join(window)
             chunk_id = f"chunk_{len(chunks)}"
             chunks.append(
                 RetrievedChunk(
                     chunk_id=chunk_id,
                     text=joined,
-                    page=_infer_page(pointer, page_map),
+                    page=infer_page(pointer),
                     embedding=None,
                     metadata={},
                 )
             )
             if config.overlap > 0:
-                overlap_tokens = " ".join(joined.split()[-config.overlap :])
+                # rsplit only separates the trailing tokens we keep.
+                overlap_tokens = " ".join(joined.rsplit(None, config.overlap)[-config.overlap :])
                 window = [overlap_tokens]
+                window_len = len(overlap_tokens)
             else:
                 window = []
+                window_len = 0
     if window:
         chunk_id = f"chunk_{len(chunks)}"
         chunks.append(
             RetrievedChunk(
                 chunk_id=chunk_id,
                 text=" ".join(window),
-                page=_infer_page(pointer, page_map),
+                page=infer_page(pointer),
                 embedding=None,
                 metadata={},
             )
@@ -61,12 +70,16 @@ def chunk_text(full_text: str, page_map: Dict[int, str], config: ChunkConfig) ->
     return chunks
 
 
-def _infer_page(pointer: int, page_map: Dict[int, str]) -> str:
+def _page_lookup(page_map: Dict[int, str]) -> Callable[[int], str]:
+    """Return a function mapping a character offset to its page via binary search."""
     if not page_map:
-        return "?"
-    cumulative = 0
-    for page_number, content in page_map.items():
-        cumulative += len(content)
-        if pointer <= cumulative:
-            return str(page_number)
-    return str(max(page_map.keys()))
+        return lambda pointer: "?"
+    bounds = list(accumulate(len(content) for content in page_map.values()))
+    pages = [str(page_number) for page_number in page_map]
+    last_page = str(max(page_map.keys()))
+
+    def _infer_page(pointer: int) -> str:
+        idx = bisect_left(bounds, pointer)
+        return pages[idx] if idx < len(pages) else last_page
+
+    return _infer_page
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import json
+import os
+import re
+import time
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime
 from pathlib import Path
 from typing import List
 
@@ -14,7 +16,7 @@ from .generation.language_models import BaseLanguageModel
 from .generation.safety import describe_safety_rules
 from .ingestion.chunker import ChunkConfig, chunk_text
 from .ingestion.pdf_loader import load_document
-from .retrieval.retriever import Retriever
+from .retrieval.retriever import EMBED_WORKERS, Retriever
 from .types import (
     AudienceProfile,
     AudienceStyle,
@@ -34,9 +36,13 @@ class SaralChatbot:
     embedding_manager: EmbeddingManager | None = None
     language_model: BaseLanguageModel | None = None
     use_llm: bool = False
+    # On-disk embedding cache (e.g. DEFAULT_CACHE_DIR); used when the bot builds its own manager.
+    cache_dir: str | os.PathLike | None = None
+    # Threads for embedding a paper's chunks with I/O-bound backends; 1 disables the pool.
+    embed_workers: int = EMBED_WORKERS
 
     def __post_init__(self) -> None:
-        self.embedding_manager = self.embedding_manager or EmbeddingManager()
+        self.embedding_manager = self.embedding_manager or EmbeddingManager(cache_dir=self.cache_dir)
         self.conversation = ConversationLog(session_id=self.session_id)
         self.generator = (
             LLMGenerator(language_model=self.language_model)
@@ -49,12 +55,23 @@ class SaralChatbot:
 
     # --------------------------- INGESTION ---------------------------
     def ingest(self, path: str, chunk_config: ChunkConfig | None = None) -> None:
+        # Stateful backends (TF-IDF) must learn each paper's vocabulary afresh.
+        self.embedding_manager.reset()
         text, page_map = load_document(path)
         chunk_config = chunk_config or ChunkConfig()
         chunks = chunk_text(text, page_map, chunk_config)
-        self.retriever = Retriever.from_chunks(chunks, self.embedding_manager)
+        self.retriever = Retriever.from_chunks(chunks, self.embedding_manager, embed_workers=self.embed_workers)
         self.sources_path = Path(path)
 
+    def reset(self) -> None:
+        """Forget the ingested paper and conversation but keep the loaded models."""
+        self.embedding_manager.reset()
+        self.session_id = str(uuid.uuid4())
+        self.conversation = ConversationLog(session_id=self.session_id)
+        self.retriever = None
+        self.sources_path = None
+        self.current_output = None
+
     # --------------------------- GENERATION ---------------------------
     def generate(
         self,
@@ -90,7 +107,7 @@ class SaralChatbot:
         after = _apply_directive(before, directive)
         blocks[index].text = after
         change = ChangeRecord(
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             user_request=directive,
             target_section=f"{section}[{index}]",
             before=before,
@@ -103,7 +120,9 @@ class SaralChatbot:
 
     # --------------------------- CONVERSATION LOGGING ---------------------------
     def save_conversation(self, path: str) -> None:
-        Path(path).write_text(json.dumps(self.conversation.to_dict(), indent=2), encoding="utf-8")
+        # json.dump streams encoded chunks to the file instead of building the whole string.
+        with Path(path).open("w", encoding="utf-8") as handle:
+            json.dump(self.conversation.to_dict(), handle, indent=2)
 
     def _log_turn(
         self,
@@ -112,20 +131,22 @@ class SaralChatbot:
         output: GenerationOutput | None = None,
         change_record: ChangeRecord | None = None,
     ) -> None:
+        output_id = self.conversation.add_snapshot(output) if output is not None else None
         self.conversation.turns.append(
-            ConversationTurn(role=role, content=content, output_snapshot=output, change_record=change_record)
+            ConversationTurn(role=role, content=content, change_record=change_record, output_id=output_id)
         )
 
 
 # ---------------------------------------------------------------------------
 
+_LESS_TECHNICAL = {"electrolyzer": "hydrogen machine", "provenance": "source"}
+_LESS_TECHNICAL_RE = re.compile("|".join(map(re.escape, _LESS_TECHNICAL)))
+
 
 def _apply_directive(text: str, directive: str) -> str:
     directive_lower = directive.lower()
     if "less technical" in directive_lower:
-        replacements = {"electrolyzer": "hydrogen machine", "provenance": "source"}
-        for old, new in replacements.items():
-            text = text.replace(old, new)
+        text = _LESS_TECHNICAL_RE.sub(lambda m: _LESS_TECHNICAL[m.group(0)], text)
     if "more visual" in directive_lower:
         text += " [Add: photo cue or chart icon]"
     if "shorter" in directive_lower:
@@ -135,7 +156,5 @@ def _apply_directive(text: str, directive: str) -> str:
 
 
 def _summarise_output(output: GenerationOutput) -> str:
-    return (
-        f"Slides={len(output.slides)}, script sentences={len(output.script)}, "
-        f"notes={len(output.notes)}, tweets={len(output.tweets)}"
-    )
+    slides, script, notes, tweets = output.counts
+    return f"Slides={slides}, script sentences={script}, notes={notes}, tweets={tweets}"
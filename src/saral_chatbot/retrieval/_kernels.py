@@ -0,0 +1,70 @@
+"""Numba kernels for the vector store's fallback cosine path."""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None  # type: ignore
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _row_dots(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in prange(matrix.shape[0]):
+            acc = np.float32(0.0)
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+
+    @njit(cache=True)
+    def _top_k_heap(scores: np.ndarray, k: int) -> np.ndarray:
+        # Min-heap of the k best scores seen so far; root is the weakest kept hit.
+        heap_scores = np.empty(k, dtype=scores.dtype)
+        heap_idx = np.empty(k, dtype=np.int64)
+        size = 0
+        for i in range(scores.shape[0]):
+            score = scores[i]
+            if size < k:
+                pos = size
+                size += 1
+                while pos > 0:
+                    parent = (pos - 1) // 2
+                    if heap_scores[parent] <= score:
+                        break
+                    heap_scores[pos] = heap_scores[parent]
+                    heap_idx[pos] = heap_idx[parent]
+                    pos = parent
+            elif score > heap_scores[0]:
+                pos = 0
+                while True:
+                    child = 2 * pos + 1
+                    if child >= k:
+                        break
+                    if child + 1 < k and heap_scores[child + 1] < heap_scores[child]:
+                        child += 1
+                    if heap_scores[child] >= score:
+                        break
+                    heap_scores[pos] = heap_scores[child]
+                    heap_idx[pos] = heap_idx[child]
+                    pos = child
+            else:
+                continue
+            heap_scores[pos] = score
+            heap_idx[pos] = i
+        return heap_idx[np.argsort(-heap_scores)]
+
+    def topk_cosine(matrix: np.ndarray, q_unit: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and dot products of the ``k`` best rows of ``matrix`` against ``q_unit``, best first."""
+        scores = _row_dots(matrix, np.ascontiguousarray(q_unit, dtype=np.float32))
+        best = _top_k_heap(scores, k)
+        return best, scores[best]
+
+else:
+    topk_cosine = None
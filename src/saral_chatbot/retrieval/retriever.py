@@ -1,45 +1,96 @@
 """Retriever orchestrating embeddings + vector store."""
 from __future__ import annotations
 
+import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import Iterable, List, Optional, Sequence
 
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
 from ..embeddings.embedding_manager import EmbeddingManager
 from ..types import RetrievalResult, RetrievedChunk
+from .semantic_cache import SemanticCache
 from .vector_store import VectorStore
 
+# Request batching for I/O-bound embedding backends; see _embed_concurrently.
+EMBED_BATCH_SIZE = 32
+EMBED_WORKERS = 4
+
 
 @dataclass
 class Retriever:
     embedding_manager: EmbeddingManager
     store: VectorStore
+    cache: SemanticCache | None = None
 
     @classmethod
-    def from_chunks(cls, chunks: Iterable[RetrievedChunk], embedding_manager: EmbeddingManager | None = None) -> "Retriever":
+    def from_chunks(
+        cls,
+        chunks: Iterable[RetrievedChunk],
+        embedding_manager: EmbeddingManager | None = None,
+        quantize: bool = False,
+        cache: SemanticCache | None = None,
+        embed_workers: int = EMBED_WORKERS,
+    ) -> "Retriever":
         manager = embedding_manager or EmbeddingManager()
-        store = VectorStore()
+        store = VectorStore(quantize=quantize)
+        chunks = list(chunks)
         texts = [chunk.text for chunk in chunks]
-        embeddings = manager.embed(texts)
-        for chunk, emb in zip(chunks, embeddings):
-            store.add(chunk, emb)
-            chunk.embedding = emb.tolist()
-        return cls(embedding_manager=manager, store=store)
+        if chunks:
+            store.bulk_add(chunks, _embed_concurrently(manager, texts, embed_workers))
+        return cls(embedding_manager=manager, store=store, cache=cache)
 
     def query(self, prompt: str, k: int = 5) -> List[RetrievalResult]:
-        query_vector = self.embedding_manager.embed([prompt])[0]
-        return self.store.similarity_search(query_vector, k=k)
+        return self.query_many([prompt], k=k)[0]
+
+    def query_many(self, prompts: Sequence[str], k: int = 5) -> List[List[RetrievalResult]]:
+        """Retrieve for several prompts with one embedding call and one scoring pass."""
+        query_matrix = self.embedding_manager.embed(prompts)
+        if self.cache is None:
+            return self.store.similarity_search_many(query_matrix, k=k)
+        results: List[Optional[List[RetrievalResult]]] = [self.cache.get(vector, k) for vector in query_matrix]
+        misses = [i for i, hits in enumerate(results) if hits is None]
+        if misses:
+            fresh = self.store.similarity_search_many(query_matrix[misses], k=k)
+            for i, hits in zip(misses, fresh):
+                self.cache.put(query_matrix[i], k, hits)
+                results[i] = hits
+        return results
 
     def to_serializable(self) -> List[dict]:
-        payload = []
-        for chunk in self.store.chunks:
-            payload.append(
-                {
-                    "chunk_id": chunk.chunk_id,
-                    "text": chunk.text,
-                    "page": chunk.page,
-                    "metadata": chunk.metadata,
-                }
-            )
-        return payload
+        return [
+            {
+                "chunk_id": chunk_id,
+                "text": text,
+                "page": page,
+                "metadata": metadata,
+            }
+            for chunk_id, text, page, metadata in zip(self.store.ids, self.store.texts, self.store.pages, self.store.metadata)
+        ]
+
+    def to_json_bytes(self) -> bytes:
+        """UTF-8 JSON for ``to_serializable()``, using orjson when it is installed."""
+        payload = self.to_serializable()
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _embed_concurrently(manager: EmbeddingManager, texts: List[str], workers: int = EMBED_WORKERS) -> np.ndarray:
+    """Embed fixed-size batches on a thread pool, keeping input order.
+
+    Only I/O-bound backends fan out. Local models already batch (and length-sort)
+    the whole corpus and would contend for the same cores and tokenizer, and
+    stateful backends (TF-IDF fits on its first call) must see the corpus at once.
+    """
+    if workers <= 1 or not manager.backend.io_bound or len(texts) <= EMBED_BATCH_SIZE:
+        return manager.embed(texts)
+    batches = [texts[start : start + EMBED_BATCH_SIZE] for start in range(0, len(texts), EMBED_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return np.concatenate(list(executor.map(manager.embed, batches)))
@@ -0,0 +1,72 @@
+"""Approximate cache of retrieval results keyed by query embedding."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..types import RetrievalResult
+
+
+@dataclass
+class SemanticCache:
+    """
+    Random-projection LSH over query embeddings.
+
+    Each of ``n_tables`` tables hashes a query to the sign pattern of ``n_bits``
+    random projections; a lookup verifies the colliding entries by cosine and
+    returns the closest one at or above ``threshold``.
+    """
+
+    n_tables: int = 4
+    n_bits: int = 16
+    threshold: float = 0.95
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        self._planes: Optional[np.ndarray] = None
+        self._tables: List[Dict[bytes, List[int]]] = [{} for _ in range(self.n_tables)]
+        self._vectors: List[np.ndarray] = []
+        self._entries: List[Tuple[int, List[RetrievalResult]]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _signatures(self, unit: np.ndarray) -> List[bytes]:
+        if self._planes is None:
+            rng = np.random.default_rng(self.seed)
+            self._planes = rng.standard_normal((self.n_tables, unit.shape[0], self.n_bits)).astype(np.float32)
+        bits = np.einsum("d,tdb->tb", unit, self._planes) > 0
+        return [np.packbits(row).tobytes() for row in bits]
+
+    def get(self, query_vector: np.ndarray, k: int) -> Optional[List[RetrievalResult]]:
+        if not self._entries:
+            return None
+        unit = _unit(query_vector)
+        candidates: Set[int] = set()
+        for table, signature in zip(self._tables, self._signatures(unit)):
+            candidates.update(table.get(signature, ()))
+        best: Optional[List[RetrievalResult]] = None
+        best_score = self.threshold
+        for idx in candidates:
+            cached_k, results = self._entries[idx]
+            if cached_k < k:
+                continue
+            score = float(np.dot(self._vectors[idx], unit))
+            if score >= best_score:
+                best, best_score = results[:k], score
+        return best
+
+    def put(self, query_vector: np.ndarray, k: int, results: List[RetrievalResult]) -> None:
+        unit = _unit(query_vector)
+        idx = len(self._entries)
+        self._vectors.append(unit)
+        self._entries.append((k, list(results)))
+        for table, signature in zip(self._tables, self._signatures(unit)):
+            table.setdefault(signature, []).append(idx)
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    return vector / (np.linalg.norm(vector) + 1e-8)
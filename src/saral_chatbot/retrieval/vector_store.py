@@ -1,30 +1,169 @@
 """Simple in-memory vector store."""
 from __future__ import annotations
 
+import logging
+import math
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, List, Optional, Sequence
 
 import numpy as np
 
+try:
+    import simsimd
+except ImportError:  # pragma: no cover - optional dependency
+    simsimd = None  # type: ignore
+
 from ..types import RetrievedChunk, RetrievalResult
+from ._kernels import topk_cosine
+
+LOGGER = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 64
+_INT8_SCALE = 127.0
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    if vectors.ndim == 1:
+        # Single vectors (queries, added rows): a BLAS dot skips linalg.norm's dispatch.
+        return vectors / (math.sqrt(float(np.vdot(vectors, vectors))) + 1e-8)
+    return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-8)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first, without a full sort."""
+    if k >= scores.shape[0]:
+        return scores.argsort()[::-1]
+    part = np.argpartition(scores, -k)[-k:]
+    return part[np.argsort(scores[part])[::-1]]
 
 
 @dataclass
 class VectorStore:
-    embeddings: List[np.ndarray] = field(default_factory=list)
-    chunks: List[RetrievedChunk] = field(default_factory=list)
+    """
+    In-memory cosine index over unit-normalized embeddings.
+
+    With ``quantize=True`` rows are stored as int8 (``round(unit * 127)``), a quarter
+    of the float32 footprint. Scans only get cheaper with the simsimd or numba
+    kernels. The plain NumPy fallback converts the whole matrix to float32 on every
+    query, which makes it slower than float32 storage. Scores carry roughly 1%
+    error, which can reorder near-tied neighbours; keep the default when exact
+    ranking matters.
+
+    Chunk fields are kept column-wise; ``RetrievedChunk`` objects are only built
+    for the hits a search returns.
+    """
+
+    ids: List[str] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    pages: List[Optional[str]] = field(default_factory=list)
+    metadata: List[Dict[str, str]] = field(default_factory=list)
+    quantize: bool = False
+    # Preallocated unit-norm rows; only the first ``len(ids)`` are populated.
+    matrix: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.float32), init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.quantize and simsimd is None and topk_cosine is None:
+            LOGGER.warning("quantize=True without simsimd or numba: int8 rows are upcast on every query")
+
+    @property
+    def dtype(self) -> type:
+        return np.int8 if self.quantize else np.float32
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """View of the populated rows of ``matrix``."""
+        return self.matrix[: len(self.ids)]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def chunk(self, index: int) -> RetrievedChunk:
+        return RetrievedChunk(
+            chunk_id=self.ids[index],
+            text=self.texts[index],
+            page=self.pages[index],
+            embedding=None,
+            metadata=self.metadata[index],
+        )
 
     def add(self, chunk: RetrievedChunk, embedding: np.ndarray) -> None:
-        self.chunks.append(chunk)
-        self.embeddings.append(embedding)
+        n = len(self.ids)
+        if n == 0 and (self.matrix.shape[1] != embedding.shape[-1] or self.matrix.dtype != self.dtype):
+            self.matrix = np.empty((_INITIAL_CAPACITY, embedding.shape[-1]), dtype=self.dtype)
+        elif n == self.matrix.shape[0]:
+            grown = np.empty((max(2 * n, _INITIAL_CAPACITY), self.matrix.shape[1]), dtype=self.dtype)
+            grown[:n] = self.matrix[:n]
+            self.matrix = grown
+        # Store unit vectors so cosine similarity is a single matrix-vector product.
+        self.matrix[n] = self._encode(embedding)
+        self.ids.append(chunk.chunk_id)
+        self.texts.append(chunk.text)
+        self.pages.append(chunk.page)
+        self.metadata.append(chunk.metadata)
+
+    def bulk_add(self, chunks: Sequence[RetrievedChunk], embeddings: np.ndarray) -> None:
+        """Add many chunks with one (N, D) copy instead of N ``add`` calls."""
+        rows = self._encode(np.asarray(embeddings, dtype=np.float32))
+        n = len(self.ids)
+        if n == 0:
+            self.matrix = np.ascontiguousarray(rows)
+        else:
+            # Grow to the exact size; later ``add`` calls fall back to doubling.
+            grown = np.empty((n + len(rows), self.matrix.shape[1]), dtype=self.dtype)
+            grown[:n] = self.matrix[:n]
+            grown[n:] = rows
+            self.matrix = grown
+        self.ids.extend(chunk.chunk_id for chunk in chunks)
+        self.texts.extend(chunk.text for chunk in chunks)
+        self.pages.extend(chunk.page for chunk in chunks)
+        self.metadata.extend(chunk.metadata for chunk in chunks)
+
+    def _encode(self, embedding: np.ndarray) -> np.ndarray:
+        return self._to_storage(_unit(np.asarray(embedding, dtype=np.float32)))
+
+    def _to_storage(self, unit: np.ndarray) -> np.ndarray:
+        if self.quantize:
+            # Scales ``unit`` in place (callers pass a fresh array) rather than
+            # allocating two more (N, D) temporaries on bulk inserts.
+            unit *= _INT8_SCALE
+            return np.rint(unit, out=unit).astype(np.int8)
+        return unit
 
     def similarity_search(self, query_embedding: np.ndarray, k: int = 5) -> List[RetrievalResult]:
-        if not self.embeddings:
-            return []
-        matrix = np.vstack(self.embeddings)
-        # cosine similarity
-        query_norm = query_embedding / (np.linalg.norm(query_embedding) + 1e-8)
-        doc_norms = matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8)
-        scores = doc_norms @ query_norm
-        best_idx = scores.argsort()[-k:][::-1]
-        return [RetrievalResult(chunk=self.chunks[i], score=float(scores[i])) for i in best_idx]
+        # Normalise while still 1-D so the vdot branch of _unit applies.
+        query_unit = _unit(np.ravel(np.asarray(query_embedding, dtype=np.float32)))
+        return self._search_units(query_unit[np.newaxis], k)[0]
+
+    def similarity_search_many(self, query_embeddings: np.ndarray, k: int = 5) -> List[List[RetrievalResult]]:
+        """Top-k hits for each row of a (Q, D) query matrix, scored in one pass."""
+        return self._search_units(_unit(np.asarray(query_embeddings, dtype=np.float32)), k)
+
+    def _search_units(self, query_units: np.ndarray, k: int) -> List[List[RetrievalResult]]:
+        if not self.ids:
+            return [[] for _ in range(len(query_units))]
+        use_kernel = len(query_units) == 1 or self.quantize
+        if simsimd is None and topk_cosine is not None and use_kernel and 0 < k < len(self.ids):
+            # Fused dot + heap top-k; avoids the score matrix and the partition pass (and,
+            # for int8 rows, the float32 upcast). Batched float32 queries are faster as
+            # one matrix product below.
+            results = []
+            for query in query_units:
+                best, scores = topk_cosine(self.embeddings, query, k)
+                if self.quantize:
+                    scores = scores / _INT8_SCALE
+                results.append([RetrievalResult(chunk=self.chunk(i), score=float(s)) for i, s in zip(best, scores)])
+            return results
+        if simsimd is not None:
+            # SIMD cosine kernel; normalizes both sides internally.
+            queries = np.ascontiguousarray(self._to_storage(query_units.copy()))
+            scores = 1.0 - np.asarray(simsimd.cdist(queries, self.embeddings, metric="cosine"))
+        else:
+            # cosine similarity; both sides are unit-norm. The float32 queries keep the
+            # product in single precision (int8 rows promote to float32).
+            scores = query_units @ self.embeddings.T
+            if self.quantize:
+                scores /= _INT8_SCALE
+        return [
+            [RetrievalResult(chunk=self.chunk(i), score=float(row[i])) for i in _top_k(row, k)]
+            for row in scores
+        ]
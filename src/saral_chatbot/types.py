@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Sequence
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 
 class AudienceStyle(str, Enum):
@@ -59,10 +62,15 @@ class GenerationOutput:
     linkedin_summaries: List[ContentBlock]
     metadata: Dict[str, str] = field(default_factory=dict)
 
+    @cached_property
+    def counts(self) -> Tuple[int, int, int, int]:
+        """(slides, script, notes, tweets) sizes; sections are not resized after generation."""
+        return len(self.slides), len(self.script), len(self.notes), len(self.tweets)
+
 
 @dataclass
 class ChangeRecord:
-    timestamp: datetime
+    timestamp: int  # nanoseconds since the Unix epoch (time.time_ns())
     user_request: str
     target_section: str
     before: str
@@ -74,14 +82,27 @@ class ChangeRecord:
 class ConversationTurn:
     role: str
     content: str
+    # SaralChatbot leaves this unset and records output_id; the log keeps only the current output.
     output_snapshot: Optional[GenerationOutput] = None
     change_record: Optional[ChangeRecord] = None
+    output_id: Optional[int] = None
 
 
 @dataclass
 class ConversationLog:
     session_id: str
     turns: List[ConversationTurn] = field(default_factory=list)
+    # Only the current output is retained, so log memory does not grow with the
+    # number of generations; revisions edit it in place and log only a ChangeRecord.
+    snapshots: Dict[int, GenerationOutput] = field(default_factory=dict)
+    current_output_id: Optional[int] = None
+
+    def add_snapshot(self, output: GenerationOutput) -> int:
+        if self.current_output_id is not None and self.snapshots[self.current_output_id] is output:
+            return self.current_output_id
+        self.current_output_id = 0 if self.current_output_id is None else self.current_output_id + 1
+        self.snapshots = {self.current_output_id: output}
+        return self.current_output_id
 
     def to_dict(self) -> Dict:
         return {
@@ -90,32 +111,37 @@ class ConversationLog:
                 {
                     "role": t.role,
                     "content": t.content,
-                    "change_record": (
-                        {
-                            "timestamp": t.change_record.timestamp.isoformat()
-                            if t.change_record
-                            else None,
-                            "user_request": t.change_record.user_request if t.change_record else None,
-                            "target_section": t.change_record.target_section if t.change_record else None,
-                            "before": t.change_record.before if t.change_record else None,
-                            "after": t.change_record.after if t.change_record else None,
-                            "rationale": t.change_record.rationale if t.change_record else None,
-                        }
-                        if t.change_record
-                        else None
-                    ),
+                    "change_record": _change_record_dict(t.change_record) if t.change_record else None,
                 }
                 for t in self.turns
             ],
         }
 
 
+def _format_timestamp(timestamp_ns: int) -> str:
+    # Naive UTC ISO string, matching the format of earlier conversation logs.
+    moment = datetime.fromtimestamp(timestamp_ns // 1_000_000_000, tz=timezone.utc)
+    return moment.replace(microsecond=timestamp_ns // 1_000 % 1_000_000, tzinfo=None).isoformat()
+
+
+def _change_record_dict(record: ChangeRecord) -> Dict:
+    return {
+        "timestamp": _format_timestamp(record.timestamp),
+        "user_request": record.user_request,
+        "target_section": record.target_section,
+        "before": record.before,
+        "after": record.after,
+        "rationale": record.rationale,
+    }
+
+
 @dataclass
 class RetrievedChunk:
     chunk_id: str
     text: str
     page: Optional[str]
-    embedding: Optional[List[float]]
+    # Vectors live in the VectorStore matrix; this stays None unless a caller sets it.
+    embedding: Optional[np.ndarray]
     metadata: Dict[str, str]
 
 